@@ -48,5 +48,13 @@ class Settings(BaseModel):
     # Global request timeout for API endpoints
     GLOBAL_REQUEST_TIMEOUT: int = int(os.getenv("GLOBAL_REQUEST_TIMEOUT", 30))
 
+    # On-demand request profiling (disabled unless a token or sample rate is set)
+    PROFILE_TOKEN: str | None = os.getenv("PROFILE_TOKEN")  # value expected in the x-profile header
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))  # 0.0 - 1.0
+    PROFILE_OUTPUT_DIR: str = os.getenv("PROFILE_OUTPUT_DIR", "/tmp/profiles")
+
+    # Event-loop lag monitor (disabled when threshold is 0)
+    LOOP_LAG_THRESHOLD_MS: int = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "0"))
+
 # Instantiate settings for use throughout the application
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,69 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from loguru import logger
+from core.config import settings
+
+# LoopLagMonitor detects callbacks that block the asyncio event loop.
+# A heartbeat coroutine stamps the time on every tick; a watchdog thread checks the
+# stamp and, when the loop has not ticked for longer than the threshold, logs the
+# current stack of the loop thread. Each stall is logged once.
+# The stack is a single snapshot of where the loop thread was when the threshold
+# was crossed; if the blocking work is a sequence of calls, the one that pushed
+# the stall over the threshold may not be the slowest of them.
+# Nothing is scheduled unless start() is called, so it costs nothing when disabled.
+class LoopLagMonitor:
+    def __init__(self, threshold_ms: int = settings.LOOP_LAG_THRESHOLD_MS):
+        self.threshold = threshold_ms / 1000
+        self._interval = max(self.threshold / 2, 0.01)
+        self._last_beat = 0.0
+        self._reported_beat = 0.0
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self):
+        # Must be called from within the running event loop (e.g. a startup hook).
+        if self.threshold <= 0 or self._task:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-lag-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"Event-loop lag monitor started (threshold {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        self._thread = None
+
+    async def _heartbeat(self):
+        while True:
+            self._last_beat = time.monotonic()
+            await asyncio.sleep(self._interval)
+
+    def _watch(self):
+        while not self._stop.wait(self._interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self._interval
+            # Report each stall once, while it is still in progress.
+            if stalled <= self.threshold or beat == self._reported_beat:
+                continue
+            self._reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            logger.warning(
+                f"Event loop blocked for more than {stalled * 1000:.0f}ms, current stack:\n{stack}"
+            )
+
+# Singleton instance for use throughout the application
+loop_monitor = LoopLagMonitor()
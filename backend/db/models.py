@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Integer, Text, String, DateTime, func
+from sqlalchemy import Integer, Text, String, DateTime, UniqueConstraint, func
 from db.base import Base
 
 # Defines ORM models for database tables using SQLAlchemy.
 # CachedSurvey stores survey data and metadata for caching purposes.
+# SurveyRevision stores versioned derivatives of a cached survey (e.g. a regenerated question).
 
 class CachedSurvey(Base):
     __tablename__ = "cached_surveys"
@@ -12,3 +13,15 @@ class CachedSurvey(Base):
     prompt: Mapped[str] = mapped_column(Text, nullable=False)
     payload: Mapped[str] = mapped_column(Text, nullable=False) 
     created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+class SurveyRevision(Base):
+    __tablename__ = "survey_revisions"
+    __table_args__ = (UniqueConstraint("prompt_hash", "version"),)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    prompt_hash: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    base_version: Mapped[int] = mapped_column(Integer, nullable=False)  # version this one was derived from
+    question_index: Mapped[int] = mapped_column(Integer, nullable=False)
+    instructions: Mapped[str] = mapped_column(Text, nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[str] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -11,7 +11,9 @@ from core.rate_limit import limiter
 from router import routers
 from middleware.jwtAuthMiddleware import JWTAuthMiddleware
 from middleware.requestIDMiddleware import RequestIDMiddleware
+from middleware.profilingMiddleware import ProfilingMiddleware
 from core.redis import redis_client
+from core.loopMonitor import loop_monitor
 
 logger = setup_logging()
 
@@ -27,11 +29,16 @@ app.add_middleware(
     allow_origins=origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["x-prompt-hash"],
 )
 app.add_middleware(JWTAuthMiddleware)
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(TimeoutMiddleware)
 app.add_middleware(SlowAPIMiddleware)
+# Outermost, so the profile covers the whole middleware stack and the endpoint.
+# Only registered when enabled, keeping the request path untouched otherwise.
+if settings.PROFILE_TOKEN or settings.PROFILE_SAMPLE_RATE > 0:
+    app.add_middleware(ProfilingMiddleware)
 
 # Include all routers from the router package for modular API endpoints.
 for router in routers:
@@ -42,9 +49,12 @@ async def startup_event():
     # Initialize Redis connection on app startup.
     await redis_client.connect()
     logger.info("Redis connected")
+    # Start the event-loop lag monitor (no-op when LOOP_LAG_THRESHOLD_MS is 0).
+    loop_monitor.start()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    loop_monitor.stop()
     # Gracefully close Redis connection on app shutdown.
     if redis_client.client:
         await redis_client.client.close()
@@ -0,0 +1,62 @@
+import asyncio
+import cProfile
+import hmac
+import os
+import random
+import time
+import uuid
+from fastapi import Request
+from starlette.middleware.base import BaseHTTPMiddleware
+from core.config import settings
+from loguru import logger
+
+# Middleware that captures a cProfile of a single request on demand.
+# A request is profiled when it carries a valid x-profile header or is picked by the
+# configured sample rate. The .prof file can be opened with pstats, snakeviz or
+# converted to a flamegraph (e.g. flameprof / gprof2dot).
+# cProfile hooks the event-loop thread, so coroutines from concurrent requests that
+# run while the profiled one is in flight show up in the same profile.
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    # Only one cProfile instance may be active per thread at a time.
+    _active = False
+
+    async def dispatch(self, request: Request, call_next):
+        if ProfilingMiddleware._active or not self._should_profile(request):
+            return await call_next(request)
+
+        # Client-supplied ids are not trusted as file names, so a fresh uuid is used.
+        profile_id = f"{int(time.time())}-{uuid.uuid4().hex}"
+        profiler = cProfile.Profile()
+        ProfilingMiddleware._active = True
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await call_next(request)
+        finally:
+            profiler.disable()
+            ProfilingMiddleware._active = False
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        # Write the profile off the event loop to avoid adding latency to the request.
+        loop = asyncio.get_event_loop()
+        try:
+            path = await loop.run_in_executor(None, lambda: self._dump(profiler, profile_id))
+            logger.info(f"Profiled {request.method} {request.url.path} in {elapsed_ms:.1f}ms -> {path}")
+            response.headers["x-profile-id"] = profile_id
+        except Exception as e:
+            logger.warning(f"Profile dump failed: {e}")
+        return response
+
+    def _should_profile(self, request: Request) -> bool:
+        # Explicit, authorized request via header takes precedence over sampling.
+        token = request.headers.get("x-profile")
+        if token and settings.PROFILE_TOKEN:
+            # Compare bytes: compare_digest rejects non-ASCII str (headers are latin-1 decoded).
+            return hmac.compare_digest(token.encode(), settings.PROFILE_TOKEN.encode())
+        return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+    def _dump(self, profiler: cProfile.Profile, profile_id: str) -> str:
+        os.makedirs(settings.PROFILE_OUTPUT_DIR, exist_ok=True)
+        path = os.path.join(settings.PROFILE_OUTPUT_DIR, f"{profile_id}.prof")
+        profiler.dump_stats(path)
+        return path
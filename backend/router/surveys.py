@@ -1,18 +1,19 @@
 import asyncio
 import json
 import sqlalchemy
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
+from fastapi import APIRouter, Depends, HTTPException, Path, status, Request, Response
 from starlette.responses import JSONResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_fixed, retry_if_exception_type
 
-from schemas.generate import GenerateIn, SurveyOut
+from schemas.generate import GenerateIn, SurveyOut, RegenerateQuestionIn, RegenerateQuestionOut
 from core.rate_limit import limiter
 from db.base import get_db
-from db.models import CachedSurvey
+from db.models import CachedSurvey, SurveyRevision
 from utils.hash import hash_prompt
-from services.llm import generate_with_llm
+from services.llm import generate_with_llm, regenerate_question_with_llm
 from utils.validate import validate_string_length
 from core.config import settings
 from core.redis import redis_client
@@ -45,6 +46,8 @@ async def generate(
 
     prompt_hash = hash_prompt(body.description)
     redis_key = f"survey:{prompt_hash}"
+    # Exposed so clients can address this survey for partial regeneration.
+    response.headers["x-prompt-hash"] = prompt_hash
 
     # 1) Redis cache
     try:
@@ -120,6 +123,86 @@ async def generate(
 
     return survey
 
+@router.post(
+    "/{prompt_hash}/questions/{index}/regenerate",
+    status_code=status.HTTP_201_CREATED,
+    response_model=RegenerateQuestionOut,
+    response_model_exclude_none=True,
+)
+@limiter.limit(settings.RATE_LIMIT)
+async def regenerate_question(
+    body: RegenerateQuestionIn,
+    request: Request,
+    prompt_hash: str = Path(pattern=r"^[0-9a-f]{64}$"),
+    index: int = Path(ge=0),
+    db: Session = Depends(get_db),
+):
+    """
+    Regenerates a single question of a cached survey using a small targeted prompt.
+    The result is stored as a new version of the survey; the original cache entry
+    for the description is left untouched.
+    """
+    if not validate_string_length(body.instructions, min_length=3, max_length=500):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Input contains restricted content",
+        )
+
+    base = await load_survey(prompt_hash, body.version, db)
+    if base is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Survey not found")
+    base_version, survey = base
+    if index >= len(survey.get("questions") or []):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Question not found")
+
+    try:
+        question = await regenerate_question_with_llm(survey, index, body.instructions)
+    except Exception as e:
+        logger.error(f"LLM question regeneration failed: {str(e)}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": {"message": "LLM generation failed", "code": "LLM_ERROR"}},
+        )
+
+    questions = list(survey["questions"])
+    questions[index] = question
+    survey = {**survey, "questions": questions}
+    survey_json = json.dumps(survey)
+
+    # Persist the derivative; the version number is assigned by the DB.
+    loop = asyncio.get_event_loop()
+    try:
+        version = await loop.run_in_executor(
+            None,
+            lambda: store_revision(prompt_hash, base_version, index, body.instructions, survey_json, db),
+        )
+    except Exception as e:
+        logger.error(f"Storing revision failed: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to store survey revision",
+        )
+    logger.info(f"Regenerated question {index} of {prompt_hash} (v{base_version} -> v{version})")
+
+    # Cache the new version in Redis (best-effort)
+    try:
+        await redis_client.setex(
+            f"survey:{prompt_hash}:v{version}",
+            settings.REDIS_CACHE_TTL,
+            survey_json
+        )
+    except Exception as e:
+        logger.warning(f"Redis caching failed: {str(e)}")
+
+    return {
+        "prompt_hash": prompt_hash,
+        "version": version,
+        "base_version": base_version,
+        "index": index,
+        "question": question,
+        "survey": survey,
+    }
+
 @router.get("/test")
 def test():
     """Simple test endpoint for health checks."""
@@ -147,3 +230,111 @@ def cache_in_db(prompt_hash: str, description: str, survey_json: str, db: Sessio
     except Exception as e:
         db.rollback()
         logger.error(f"DB cache commit failed: {str(e)}")
+
+async def load_survey(prompt_hash: str, version: int | None, db: Session) -> tuple[int, dict] | None:
+    """
+    Loads a survey by prompt hash and version, returning (version, survey).
+    Version 0 is the original cached survey; None resolves to the latest revision,
+    falling back to the original when no revisions exist.
+    Raises 503 if the DB cannot be read and Redis does not have the survey.
+    """
+    loop = asyncio.get_event_loop()
+
+    if version != 0:
+        # Explicit versions may still be in Redis
+        if version:
+            try:
+                cached_data = await redis_client.get(f"survey:{prompt_hash}:v{version}")
+                if cached_data:
+                    return version, json.loads(cached_data.decode("utf-8"))
+            except Exception as e:
+                logger.warning(f"Redis get failed: {e}")
+
+        def query():
+            q = db.query(SurveyRevision).filter(SurveyRevision.prompt_hash == prompt_hash)
+            if version is not None:
+                q = q.filter(SurveyRevision.version == version)
+            return q.order_by(SurveyRevision.version.desc()).first()
+
+        try:
+            revision = await loop.run_in_executor(None, query)
+        except Exception as e:
+            # Falling back to the original here would silently fork from an older version.
+            logger.warning(f"DB read failed: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Survey revisions unavailable",
+            )
+        if revision:
+            return revision.version, json.loads(revision.payload)
+        if version:
+            return None
+
+    # Original survey: Redis first, then DB
+    try:
+        cached_data = await redis_client.get(f"survey:{prompt_hash}")
+        if cached_data:
+            return 0, json.loads(cached_data.decode("utf-8"))
+    except Exception as e:
+        logger.warning(f"Redis get failed: {e}")
+
+    try:
+        cached_survey = await loop.run_in_executor(
+            None,
+            lambda: db.query(CachedSurvey)
+                      .filter(CachedSurvey.prompt_hash == prompt_hash)
+                      .first()
+        )
+    except Exception as e:
+        logger.warning(f"DB read failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Survey cache unavailable",
+        )
+    if cached_survey:
+        return 0, json.loads(cached_survey.payload)
+    return None
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_fixed(0.5),
+    retry=retry_if_exception_type(
+        (sqlalchemy.exc.OperationalError, sqlalchemy.exc.IntegrityError)
+    ),
+    reraise=True,
+)
+def store_revision(
+    prompt_hash: str,
+    base_version: int,
+    index: int,
+    instructions: str,
+    survey_json: str,
+    db: Session,
+) -> int:
+    """
+    Synchronous revision insert for executor; returns the new version number.
+    Retries on integrity errors in case a concurrent request took the same version.
+    base_version records which version the edit was applied to, so forks are traceable.
+    """
+    try:
+        latest = (
+            db.query(func.max(SurveyRevision.version))
+              .filter(SurveyRevision.prompt_hash == prompt_hash)
+              .scalar()
+        )
+        revision = SurveyRevision(
+            prompt_hash=prompt_hash,
+            version=(latest or 0) + 1,
+            base_version=base_version,
+            question_index=index,
+            instructions=instructions,
+            payload=survey_json
+        )
+        db.add(revision)
+        db.commit()
+        logger.info(f"Stored revision v{revision.version}: {prompt_hash}")
+        return revision.version
+    except Exception as e:
+        db.rollback()
+        logger.error(f"DB revision commit failed: {str(e)}")
+        raise
@@ -18,3 +18,16 @@ class SurveyOut(BaseModel):
 
 class GenerateIn(BaseModel):
     description: str = Field(min_length=5, max_length=2000)
+
+class RegenerateQuestionIn(BaseModel):
+    instructions: str = Field(min_length=3, max_length=500)
+    # Survey version to edit: 0 is the original cached survey, omitted means latest
+    version: Optional[int] = Field(default=None, ge=0)
+
+class RegenerateQuestionOut(BaseModel):
+    prompt_hash: str
+    version: int
+    base_version: int
+    index: int
+    question: Question
+    survey: SurveyOut
@@ -6,6 +6,7 @@ from core.retryPolicy import RETRY_POLICY
 import groq
 from loguru import logger
 from core.config import settings
+from schemas.generate import Question
 import httpx
 
 # This module integrates with the Groq LLM API to generate surveys from user descriptions.
@@ -40,6 +41,25 @@ Rules:
 - Output MUST be a single JSON object.
 """
 
+# Targeted prompt for replacing a single question; keeps input and output tokens small.
+QUESTION_SYSTEM_PROMPT = """
+You are an expert survey designer editing ONE question of an existing survey.
+
+Return ONLY a single JSON object (no markdown fences, no commentary) matching:
+
+{
+  "type": "multipleChoice" | "singleChoice" | "openQuestion" | "shortAnswer" | "scale" | "npsScore",
+  "title": "string (question text)",
+  "options": ["string", "..."]  // include only for choice-based questions; omit otherwise
+}
+
+Rules:
+- Follow the user's instructions for the replacement question.
+- Keep it neutral, unbiased and consistent with the survey topic.
+- Do not duplicate any of the other questions listed.
+- Do NOT include any fields other than the ones defined above.
+"""
+
 def _call_groq(description: str) -> dict:
     resp = groq_client.chat.completions.create(
         model=settings.GROQ_MODEL,
@@ -54,6 +74,28 @@ def _call_groq(description: str) -> dict:
     content = resp.choices[0].message.content
     return json.loads(content)
 
+def _call_groq_question(survey: dict, index: int, instructions: str) -> dict:
+    # Only the survey title, sibling question titles and the target question are sent.
+    others = [q["title"] for i, q in enumerate(survey["questions"]) if i != index]
+    context = {
+        "survey_title": survey.get("title", ""),
+        "other_questions": others,
+        "current_question": survey["questions"][index],
+        "instructions": instructions,
+    }
+    resp = groq_client.chat.completions.create(
+        model=settings.GROQ_MODEL,
+        messages=[
+            {"role": "system", "content": QUESTION_SYSTEM_PROMPT},
+            {"role": "user", "content": json.dumps(context)}
+        ],
+        temperature=0.3,
+        max_tokens=300,
+        response_format={"type": "json_object"},
+    )
+    content = resp.choices[0].message.content
+    return json.loads(content)
+
 def _validate_against_schema_like(data: dict) -> bool:
     # Lightweight structural validation aligned to schemas/generate.py (Option A)
     if not isinstance(data, dict): return False
@@ -84,4 +126,21 @@ async def generate_with_llm(description: str) -> dict:
         return data
     except Exception as e:
         logger.error(f"LLM call failed: {e}")
-        raise
\ No newline at end of file
+        raise
+
+@RETRY_POLICY
+async def regenerate_question_with_llm(survey: dict, index: int, instructions: str) -> dict:
+    """
+    Calls Groq to produce a replacement for survey["questions"][index].
+    Output is validated against schemas.generate.Question before being returned.
+    """
+    loop = asyncio.get_event_loop()
+    try:
+        data = await loop.run_in_executor(
+            None, lambda: _call_groq_question(survey, index, instructions)
+        )
+        question = Question.model_validate(data)
+        return question.model_dump(exclude_none=True)
+    except Exception as e:
+        logger.error(f"LLM question regeneration failed: {e}")
+        raise